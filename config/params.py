@@ -22,4 +22,8 @@ OPEN_INTEREST_MIN = 100
 SCORE_MIN = 0.05
 
 # Put management parameters
-PUT_TARGET_PCT = 0.90  # Close at +/- 90% P&L
\ No newline at end of file
+PUT_TARGET_PCT = 0.90  # Close at +/- 90% P&L
+
+# Market data caching parameters
+QUOTE_CACHE_TTL = 5  # Seconds to reuse stock price and option snapshot responses
+QUOTE_CACHE_MIN_TARGET_PCT = 0.50  # Tighter put management targets always fetch fresh quotes
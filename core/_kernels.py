@@ -0,0 +1,81 @@
+"""
+Numerical kernels for managing open put positions.
+
+Numba is an optional dependency (`uv pip install -e .[fast]`).  For portfolios of at least
+NUMBA_MIN_POSITIONS positions the kernels are JIT-compiled into a single fused pass; smaller
+portfolios, or installs without Numba, use NumPy.
+"""
+from functools import lru_cache
+import numpy as np
+
+# Reason codes returned by classify()
+NO_CLOSE = 0
+PROFIT_TARGET = 1
+LOSS_LIMIT = 2
+
+# Below this many positions NumPy takes microseconds, far less than importing Numba and
+# loading its compiled kernel, so Numba is only used (and imported) for larger portfolios.
+NUMBA_MIN_POSITIONS = 1000
+
+
+def _classify_numpy(premium, current, target_pct):
+    pnl = premium - current
+    pct = np.divide(pnl, premium, out=np.zeros_like(pnl), where=premium > 0)
+    reason_codes = np.where(pct >= target_pct, PROFIT_TARGET,
+                            np.where(pct <= -target_pct, LOSS_LIMIT, NO_CLOSE)).astype(np.int8)
+    return reason_codes != NO_CLOSE, reason_codes, pnl, pct
+
+
+def _classify_loop(premium, current, target_pct):
+    # Serial loop: thread launch for a parallel loop costs more than the work.
+    n = premium.shape[0]
+    to_close = np.zeros(n, dtype=np.bool_)
+    reason_codes = np.zeros(n, dtype=np.int8)
+    pnl = np.empty(n, dtype=np.float64)
+    pct = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        pnl[i] = premium[i] - current[i]
+        pct[i] = pnl[i] / premium[i] if premium[i] > 0 else 0.0
+        if pct[i] >= target_pct:
+            reason_codes[i] = PROFIT_TARGET
+            to_close[i] = True
+        elif pct[i] <= -target_pct:
+            reason_codes[i] = LOSS_LIMIT
+            to_close[i] = True
+    return to_close, reason_codes, pnl, pct
+
+
+@lru_cache(maxsize=1)
+def _get_numba_kernel():
+    """
+    Import Numba and JIT-compile _classify_loop on first use, loading it from the on-disk cache
+    when available.  Returns None when Numba is not installed.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_classify_loop)
+
+
+def classify(premium, current, target_pct):
+    """
+    Classify short put positions against a +/- target_pct P&L threshold.
+
+    Args:
+        premium: float64 array of premium collected per position
+        current: float64 array of current option price per position
+        target_pct: Close threshold as a fraction of premium collected
+
+    Returns:
+        (to_close, reason_codes, pnl, pnl_pct) arrays, where reason_codes holds
+        NO_CLOSE, PROFIT_TARGET or LOSS_LIMIT for each position.
+    """
+    premium = np.ascontiguousarray(premium, dtype=np.float64)
+    current = np.ascontiguousarray(current, dtype=np.float64)
+    target_pct = float(target_pct)
+    if premium.shape[0] >= NUMBA_MIN_POSITIONS:
+        kernel = _get_numba_kernel()
+        if kernel is not None:
+            return kernel(premium, current, target_pct)
+    return _classify_numpy(premium, current, target_pct)
@@ -1,5 +1,6 @@
-from config.params import EXPIRATION_MIN, EXPIRATION_MAX
+from config.params import EXPIRATION_MIN, EXPIRATION_MAX, QUOTE_CACHE_TTL
 from .user_agent_mixin import UserAgentMixin 
+from .utils import TTLCache
 from alpaca.trading.client import TradingClient
 from alpaca.data.historical.option import OptionHistoricalDataClient
 from alpaca.data.historical.stock import StockHistoricalDataClient, StockLatestTradeRequest
@@ -25,6 +26,16 @@ class BrokerClient:
         self.trade_client = TradingClientSigned(api_key=api_key, secret_key=secret_key, paper=paper)
         self.stock_client = StockHistoricalDataClientSigned(api_key=api_key, secret_key=secret_key)
         self.option_client = OptionHistoricalDataClientSigned(api_key=api_key, secret_key=secret_key)
+        self.quote_cache = TTLCache(maxsize=1024, ttl=QUOTE_CACHE_TTL)
+
+    def _cached(self, name, symbol, fetch, use_cache):
+        """
+        Return fetch(symbol), reusing a response for the same set of symbols from the last QUOTE_CACHE_TTL seconds when use_cache is set.
+        """
+        if not use_cache:
+            return fetch(symbol)
+        key = (name, frozenset([symbol] if isinstance(symbol, str) else symbol))
+        return self.quote_cache.get_or_fetch(key, lambda: fetch(symbol))
 
     def get_positions(self):
         return self.trade_client.get_all_positions()
@@ -35,7 +46,10 @@ class BrokerClient:
         )
         self.trade_client.submit_order(req)
 
-    def get_option_snapshot(self, symbol):
+    def get_option_snapshot(self, symbol, use_cache=False):
+        return self._cached('option_snapshot', symbol, self._get_option_snapshot, use_cache)
+
+    def _get_option_snapshot(self, symbol):
         if isinstance(symbol, str):
             req = OptionSnapshotRequest(symbol_or_symbols=symbol)
             return self.option_client.get_option_snapshot(req)
@@ -54,7 +68,10 @@ class BrokerClient:
         else:
             raise ValueError("Input must be a string or list of strings representing symbols.")
 
-    def get_stock_latest_trade(self, symbol):
+    def get_stock_latest_trade(self, symbol, use_cache=False):
+        return self._cached('stock_latest_trade', symbol, self._get_stock_latest_trade, use_cache)
+
+    def _get_stock_latest_trade(self, symbol):
         req = StockLatestTradeRequest(symbol_or_symbols=symbol)
         return self.stock_client.get_stock_latest_trade(req)
 
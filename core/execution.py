@@ -1,13 +1,37 @@
+import asyncio
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from .strategy import filter_underlying, filter_options, score_options, select_options
 from models.contract import Contract
+from models.closed_position import ClosedPosition
+from config.params import QUOTE_CACHE_MIN_TARGET_PCT
 import numpy as np
-from .utils import parse_option_symbol
+from .utils import parse_option_symbols
+from ._kernels import classify, PROFIT_TARGET
 from alpaca.trading.requests import MarketOrderRequest
 from alpaca.trading.enums import OrderSide, OrderType, TimeInForce, AssetClass
 
 logger = logging.getLogger(f"strategy.{__name__}")
 
+# Max number of close orders in flight at once, to stay within Alpaca rate limits.
+MAX_CONCURRENT_ORDERS = 8
+
+# Option symbols are parsed in chunks on a thread pool when there are more than this many positions
+# and the interpreter is free-threaded.  With the GIL, regex matching cannot run in parallel.
+PARALLEL_PARSE_MIN = 500
+PARSE_CHUNK_SIZE = 64
+
+# Buy-to-close order template.  Copied with the symbol and quantity filled in, which skips
+# re-validating the fixed side / type / time in force fields for every order.
+_CLOSE_ORDER_TEMPLATE = MarketOrderRequest(
+    symbol="X",
+    qty=1,
+    side=OrderSide.BUY,
+    type=OrderType.MARKET,
+    time_in_force=TimeInForce.DAY
+)
+
 def sell_puts(client, allowed_symbols, buying_power, strat_logger = None):
     """
     Scan allowed symbols and sell short puts up to the buying power limit.
@@ -66,6 +90,43 @@ def sell_calls(client, symbol, purchase_price, stock_qty, strat_logger = None):
     else:
         logger.info(f"No viable call options found for {symbol}")
 
+def _gil_enabled():
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+def _parse_option_symbols(symbols):
+    """
+    Parse option symbols with parse_option_symbols.  On free-threaded builds, large portfolios are
+    split into chunks parsed on a thread pool; otherwise the pool is slower than parsing inline.
+    """
+    if len(symbols) <= PARALLEL_PARSE_MIN or _gil_enabled():
+        return parse_option_symbols(symbols)
+
+    offsets = range(0, len(symbols), PARSE_CHUNK_SIZE)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(parse_option_symbols, [symbols[o:o + PARSE_CHUNK_SIZE] for o in offsets]))
+
+    indices, underlyings, option_types, strikes, invalid = [], [], [], [], []
+    for offset, (chunk_indices, chunk_underlyings, chunk_types, chunk_strikes, chunk_invalid) in zip(offsets, results):
+        indices.extend(offset + i for i in chunk_indices)
+        underlyings.extend(chunk_underlyings)
+        option_types.extend(chunk_types)
+        strikes.append(chunk_strikes)
+        invalid.extend(chunk_invalid)
+    return indices, underlyings, option_types, np.concatenate(strikes), invalid
+
+async def _submit_orders(client, orders):
+    """
+    Submit orders concurrently, with at most MAX_CONCURRENT_ORDERS in flight.  Returns one order
+    response (or the raised exception) per request, in the same order as the requests.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ORDERS)
+
+    async def submit(order):
+        async with semaphore:
+            return await asyncio.to_thread(client.trade_client.submit_order, order)
+
+    return await asyncio.gather(*[submit(o) for o in orders], return_exceptions=True)
+
 def manage_open_puts(client, target_pct=0.90, strat_logger=None):
     """
     Check open put positions and buy them back when unrealized profit/loss reaches 
@@ -75,157 +136,178 @@ def manage_open_puts(client, target_pct=0.90, strat_logger=None):
         client: BrokerClient instance
         target_pct: Close position when profit OR loss reaches this percentage of premium collected (default 90%)
         strat_logger: Strategy logger for tracking closures
+    
+    Returns:
+        List of ClosedPosition objects (empty when no positions were closed)
+    """
+    return asyncio.run(_manage_open_puts_async(client, target_pct, strat_logger))
+
+async def _manage_open_puts_async(client, target_pct, strat_logger):
+    """
+    Async implementation of manage_open_puts.  Market data requests and close orders
+    are issued concurrently so latency scales with the slowest call rather than the sum.
     """
     positions = client.get_positions()
     put_positions = [p for p in positions if p.asset_class == AssetClass.US_OPTION and int(p.qty) < 0]
     
     if not put_positions:
         logger.info("No open put positions to manage")
-        return
+        return []
     
     logger.info(f"Managing {len(put_positions)} open put positions")
     
-    # Get current stock prices for all underlyings
-    underlyings = []
-    put_details = {}
-    
-    for position in put_positions:
-        try:
-            underlying, option_type, strike_price = parse_option_symbol(position.symbol)
-            if option_type == 'P':  # Only process puts
-                underlyings.append(underlying)
-                put_details[position.symbol] = {
-                    'underlying': underlying,
-                    'strike': strike_price,
-                    'qty': abs(int(position.qty)),
-                    'avg_entry_price': abs(float(position.avg_entry_price)),  # Premium collected (make positive)
-                    'position': position
-                }
-        except ValueError as e:
-            logger.warning(f"Could not parse option symbol {position.symbol}: {e}")
-            continue
+    # Parse all option symbols in one batch
+    parsed_idx, parsed_underlyings, option_types, parsed_strikes, invalid = _parse_option_symbols(
+        [p.symbol for p in put_positions])
+    for symbol in invalid:
+        logger.warning(f"Could not parse option symbol {symbol}: Invalid option symbol format")
     
-    if not underlyings:
+    puts = [k for k, option_type in enumerate(option_types) if option_type == 'P']  # Only process puts
+    if not puts:
         logger.info("No valid put positions found")
-        return
+        return []
     
-    # Get current stock prices
-    try:
-        stock_prices = client.get_stock_latest_trade(list(set(underlyings)))
-    except Exception as e:
-        logger.error(f"Failed to get stock prices: {e}")
-        return
+    # Store put positions as parallel arrays, one entry per position
+    n = len(puts)
+    pos_idx = [parsed_idx[k] for k in puts]
+    symbols = [put_positions[j].symbol for j in pos_idx]
+    underlyings = [parsed_underlyings[k] for k in puts]
+    u_to_idx = {}  # Unique underlyings, mapped to their index in the stock price array
+    u_idx = np.fromiter((u_to_idx.setdefault(u, len(u_to_idx)) for u in underlyings), dtype=np.intp, count=n)
+    strikes = parsed_strikes[puts]
     
-    # Get current option prices
-    option_symbols = list(put_details.keys())
-    try:
-        option_snapshots = client.get_option_snapshot(option_symbols)
-    except Exception as e:
-        logger.error(f"Failed to get option snapshots: {e}")
-        return
+    # Quantities and premiums arrive as strings; convert them all at once
+    qty_arr = np.abs(np.fromiter((int(p.qty) for p in put_positions), dtype=np.int32, count=len(put_positions)))
+    premium_arr = np.abs(np.fromiter((float(p.avg_entry_price) for p in put_positions), dtype=np.float64, count=len(put_positions)))
+    qtys = qty_arr[pos_idx]
+    premiums = premium_arr[pos_idx]  # Premium collected (made positive)
     
-    positions_to_close = []
+    # Get current stock and option prices concurrently.  Recently fetched quotes are reused
+    # unless the target is tight enough that fresh prices matter.
+    use_cache = target_pct >= QUOTE_CACHE_MIN_TARGET_PCT
+    stock_prices, option_snapshots = await asyncio.gather(
+        asyncio.to_thread(client.get_stock_latest_trade, list(u_to_idx), use_cache=use_cache),
+        asyncio.to_thread(client.get_option_snapshot, symbols, use_cache=use_cache),
+        return_exceptions=True
+    )
+    if isinstance(stock_prices, Exception):
+        logger.error(f"Failed to get stock prices: {stock_prices}")
+        return []
+    if isinstance(option_snapshots, Exception):
+        logger.error(f"Failed to get option snapshots: {option_snapshots}")
+        return []
     
-    for option_symbol, details in put_details.items():
-        underlying = details['underlying']
-        strike = details['strike']
-        premium_collected = details['avg_entry_price']
-        qty = details['qty']
-        
-        # Get current stock price
-        if underlying not in stock_prices:
-            logger.warning(f"No stock price data for {underlying}")
-            continue
-        
-        current_stock_price = stock_prices[underlying].price
-        
-        # Get current option price
-        if option_symbol not in option_snapshots:
-            logger.warning(f"No option price data for {option_symbol}")
-            continue
-        
-        option_snapshot = option_snapshots[option_symbol]
-        
-        # Use mid price or latest trade price
-        if hasattr(option_snapshot, 'latest_quote') and option_snapshot.latest_quote:
-            if option_snapshot.latest_quote.bid_price and option_snapshot.latest_quote.ask_price:
-                current_option_price = (option_snapshot.latest_quote.bid_price + option_snapshot.latest_quote.ask_price) / 2
-            else:
-                current_option_price = option_snapshot.latest_quote.ask_price or 0
-        elif hasattr(option_snapshot, 'latest_trade') and option_snapshot.latest_trade:
-            current_option_price = option_snapshot.latest_trade.price
-        else:
-            logger.warning(f"No price data available for {option_symbol}")
-            continue
-        
-        # Calculate P&L percentage
-        # For short puts: profit when option price decreases, loss when it increases
-        # Unrealized P&L = Premium Collected - Current Option Price
-        unrealized_pnl = premium_collected - current_option_price
-        
-        # Calculate P&L as percentage of premium collected
-        if premium_collected > 0:
-            pnl_percentage = unrealized_pnl / premium_collected
-        else:
-            pnl_percentage = 0
-        
-        # Check closure conditions
-        # Close if profit reaches +90% OR loss reaches -90%
-        should_close = abs(pnl_percentage) >= target_pct
+    # Gather each position's stock price from the per-underlying prices (NaN where missing)
+    price_arr = np.array([stock_prices[u].price if u in stock_prices else np.nan for u in u_to_idx], dtype=np.float64)
+    stock_price = price_arr[u_idx]
+    
+    # Extract quote and trade prices for each position in one pass (NaN where missing)
+    bid = np.full(n, np.nan)
+    ask = np.full(n, np.nan)
+    trade = np.full(n, np.nan)
+    
+    for i in range(n):
+        option_snapshot = option_snapshots.get(symbols[i])
+        latest_quote = getattr(option_snapshot, 'latest_quote', None)
+        latest_trade = getattr(option_snapshot, 'latest_trade', None)
+        if latest_quote:
+            bid[i] = latest_quote.bid_price or np.nan
+            ask[i] = latest_quote.ask_price or np.nan
+        if latest_trade:
+            trade[i] = latest_trade.price or np.nan
+    
+    # Use mid price, falling back to ask price and then latest trade price
+    mid = (bid + ask) * 0.5
+    option_price = np.where(~np.isnan(mid), mid, np.where(~np.isnan(ask), ask, trade))
+    
+    missing_stock = np.isnan(stock_price)
+    if missing_stock.any():
+        missing = [u for u, k in u_to_idx.items() if np.isnan(price_arr[k])]
+        logger.warning(f"No stock price data for {', '.join(missing)}")
+    
+    missing_option = np.isnan(option_price)
+    if missing_option.any():
+        missing = [symbols[i] for i in np.flatnonzero(missing_option)]
+        logger.warning(f"No option price data for {', '.join(missing)}")
+    
+    # Calculate P&L for all priced positions at once
+    # For short puts: profit when option price decreases, loss when it increases
+    # Unrealized P&L = Premium Collected - Current Option Price
+    priced_idx = np.flatnonzero(~(missing_stock | missing_option))
+    premium = premiums[priced_idx]
+    stock_price = stock_price[priced_idx]
+    current_price = option_price[priced_idx]
+    
+    # Close if profit reaches +90% OR loss reaches -90% of premium collected
+    to_close, reason_codes, pnl, pct = classify(premium, current_price, target_pct)
+    
+    # Current status is collected and logged as a single record
+    status_lines = [
+        f"{symbols[i]}: Stock=${stock_price[k]:.2f}, Strike=${strikes[i]:.2f}, "
+        f"Premium=${premium[k]:.2f}, Current=${current_price[k]:.2f}, "
+        f"P&L=${pnl[k]:.2f}, P&L%={pct[k]:.1%}"
+        for k, i in enumerate(priced_idx)
+    ]
+    
+    positions_to_close = []
+    for k in np.flatnonzero(to_close):
+        i = priced_idx[k]
+        option_symbol = symbols[i]
+        if reason_codes[k] == PROFIT_TARGET:
+            reason = 'profit_target'
+            status_lines.append(f"Profit target reached for {option_symbol}: "
+                                f"Profit {pct[k]:.1%} >= {target_pct:.1%}, P&L=${pnl[k]:.2f}")
+        else:  # pct <= -target_pct
+            reason = 'loss_limit'
+            status_lines.append(f"Loss limit reached for {option_symbol}: "
+                                f"Loss {pct[k]:.1%} <= -{target_pct:.1%}, P&L=${pnl[k]:.2f}")
         
-        # Log current status
-        logger.info(f"{option_symbol}: Stock=${current_stock_price:.2f}, Strike=${strike:.2f}, "
-                   f"Premium=${premium_collected:.2f}, Current=${current_option_price:.2f}, "
-                   f"P&L=${unrealized_pnl:.2f}, P&L%={pnl_percentage:.1%}")
+        positions_to_close.append((i, reason, float(pnl[k])))
+    
+    if status_lines:
+        logger.info("\n".join(status_lines))
+    
+    # Close positions that meet criteria.  Alpaca has no bulk order endpoint, so each order is
+    # its own request; all are submitted together with at most MAX_CONCURRENT_ORDERS in flight.
+    close_orders = []
+    action_lines = []
+    for i, reason, pnl in positions_to_close:
+        option_symbol = symbols[i]
+        action_desc = "taking profit" if reason == 'profit_target' else "cutting loss"
+        action_lines.append(f"Buying back put {option_symbol} - {action_desc}. P&L: ${pnl:.2f}")
         
-        if should_close:
-            if pnl_percentage >= target_pct:
-                reason = 'profit_target'
-                logger.info(f"Profit target reached for {option_symbol}: "
-                           f"Profit {pnl_percentage:.1%} >= {target_pct:.1%}, P&L=${unrealized_pnl:.2f}")
-            else:  # pnl_percentage <= -target_pct
-                reason = 'loss_limit'
-                logger.info(f"Loss limit reached for {option_symbol}: "
-                           f"Loss {pnl_percentage:.1%} <= -{target_pct:.1%}, P&L=${unrealized_pnl:.2f}")
-            
-            positions_to_close.append((details, reason, unrealized_pnl))
-    
-    # Close positions that meet criteria
+        # Create buy-to-close order (positive quantity to close short position)
+        close_orders.append(_CLOSE_ORDER_TEMPLATE.model_copy(update={
+            'symbol': option_symbol,
+            'qty': int(qtys[i])  # Positive quantity to close short position
+        }))
+    
+    if action_lines:
+        logger.info("\n".join(action_lines))
+    
+    order_responses = await _submit_orders(client, close_orders)
+    
     closed_positions = []
-    for details, reason, pnl in positions_to_close:
-        option_symbol = details['position'].symbol
-        qty = details['qty']
+    for (i, reason, pnl), order_response in zip(positions_to_close, order_responses):
+        option_symbol = symbols[i]
+        if isinstance(order_response, Exception):
+            logger.error(f"Failed to close position {option_symbol}: {order_response}")
+            continue
         
-        try:
-            action_desc = "taking profit" if reason == 'profit_target' else "cutting loss"
-            logger.info(f"Buying back put {option_symbol} - {action_desc}. P&L: ${pnl:.2f}")
-            
-            # Create buy-to-close order (positive quantity to close short position)
-            close_order = MarketOrderRequest(
-                symbol=option_symbol,
-                qty=qty,  # Positive quantity to close short position
-                side=OrderSide.BUY,
-                type=OrderType.MARKET,
-                time_in_force=TimeInForce.DAY
-            )
-            
-            order_response = client.trade_client.submit_order(close_order)
-            logger.info(f"Successfully submitted close order for {option_symbol}: {order_response.id}")
-            
-            closed_positions.append({
-                'symbol': option_symbol,
-                'underlying': details['underlying'],
-                'strike': details['strike'],
-                'reason': reason,
-                'pnl': pnl,
-                'premium_collected': details['avg_entry_price'],
-                'order_id': order_response.id
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to close position {option_symbol}: {e}")
+        closed_positions.append(ClosedPosition(
+            symbol=option_symbol,
+            underlying=underlyings[i],
+            strike=float(strikes[i]),
+            reason=reason,
+            pnl=pnl,
+            premium_collected=float(premiums[i]),
+            order_id=str(order_response.id)
+        ))
     
     # Log closed positions
+    if closed_positions:
+        logger.info("Successfully submitted close orders: " +
+                    ", ".join(f"{p.symbol} ({p.order_id})" for p in closed_positions))
     if closed_positions and strat_logger:
         strat_logger.log_closed_puts(closed_positions)
     
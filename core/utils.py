@@ -1,7 +1,12 @@
 import re
+import threading
+import time
 import pytz
+import numpy as np
 from datetime import datetime
 
+_OCC_RE = re.compile(r'^([A-Za-z]+)(\d{6})([PC])(\d{8})$')
+
 def parse_option_symbol(symbol):
     """
     Parses OCC-style option symbol.
@@ -9,7 +14,7 @@ def parse_option_symbol(symbol):
     Example:
         'AAPL250516P00207500' -> ('AAPL', 'P', 207.5)
     """
-    match = re.match(r'^([A-Za-z]+)(\d{6})([PC])(\d{8})$', symbol)
+    match = _OCC_RE.match(symbol)
     
     if match:
         underlying = match.group(1)
@@ -20,7 +25,77 @@ def parse_option_symbol(symbol):
     else:
         raise ValueError(f"Invalid option symbol format: {symbol}")
 
+def parse_option_symbols(symbols):
+    """
+    Parses a batch of OCC-style option symbols.
+
+    Returns:
+        (indices, underlyings, option_types, strikes, invalid) where indices are the positions of the
+        valid symbols in the input, strikes is a float64 array, and invalid lists unparseable symbols.
+    """
+    matches = [_OCC_RE.match(s) for s in symbols]
+    indices = [i for i, m in enumerate(matches) if m]
+    invalid = [symbols[i] for i, m in enumerate(matches) if not m]
+    underlyings = [matches[i].group(1) for i in indices]
+    option_types = [matches[i].group(3) for i in indices]
+    strikes = np.fromiter((int(matches[i].group(4)) for i in indices), dtype=np.float64, count=len(indices)) / 1000.0
+    return indices, underlyings, option_types, strikes, invalid
+
 def get_ny_timestamp():
     ny_tz = pytz.timezone("America/New_York")
     ny_time = datetime.now(ny_tz)
-    return ny_time.isoformat()
\ No newline at end of file
+    return ny_time.isoformat()
+
+class TTLCache:
+    """
+    Minimal thread-safe in-memory cache whose entries expire ttl seconds after they are stored.
+    Once maxsize entries are held, expired entries are dropped first, then the least recently
+    stored entry is evicted.
+    """
+    def __init__(self, maxsize=1024, ttl=5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, timestamp = entry
+            if time.monotonic() - timestamp > self.ttl:
+                self._remove(key)
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)  # Re-stored keys move to the end of the eviction order
+            if len(self._data) >= self.maxsize:
+                now = time.monotonic()
+                for expired in [k for k, (_, timestamp) in self._data.items() if now - timestamp > self.ttl]:
+                    self._remove(expired)
+            if len(self._data) >= self.maxsize:
+                self._remove(next(iter(self._data)))
+            self._data[key] = (value, time.monotonic())
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Return the cached value for key, calling fetch() to fill it on a miss.
+        Concurrent misses for the same key only fetch once; different keys fetch in parallel.
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self.get(key)
+            if value is None:
+                value = fetch()
+                self.set(key, value)
+        return value
+
+    def _remove(self, key):
+        # Caller must hold self._lock
+        self._data.pop(key, None)
+        self._key_locks.pop(key, None)
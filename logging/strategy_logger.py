@@ -2,6 +2,10 @@ from pathlib import Path
 from datetime import datetime
 from core.utils import get_ny_timestamp
 import json
+import logging
+import orjson
+
+logger = logging.getLogger(f"strategy.{__name__}")
 
 class StrategyLogger:
     def __init__(self, enabled=True, log_path="logs/strategy_log.json"):
@@ -69,8 +73,8 @@ class StrategyLogger:
                 self.log_entry["sold_puts"] = []
             self.log_entry["sold_puts"].append(put_dict)
 
-    def log_closed_puts(self, closed_puts):
-        """Log puts that were closed for risk management"""
+    def log_closed_puts(self, closed_puts: list):
+        """Log puts (ClosedPosition objects) that were closed for risk management"""
         if self.enabled:
             if self.log_entry.get("closed_puts") is None:
                 self.log_entry["closed_puts"] = []
@@ -81,17 +85,28 @@ class StrategyLogger:
             return
         # Load existing log data if file exists
         if self.log_file.exists():
-            with open(self.log_file, "r") as f:
+            with open(self.log_file, "rb") as f:
+                raw = f.read()
+            try:
+                data = orjson.loads(raw) if raw.strip() else []
+            except orjson.JSONDecodeError:
+                # Logs written by json.dump may contain NaN / Infinity, which orjson rejects
                 try:
-                    data = json.load(f)
-                    if not isinstance(data, list):
-                        raise ValueError("Log file does not contain a list.")
+                    data = json.loads(raw)
                 except json.JSONDecodeError:
-                    data = []
+                    data = None
+            if not isinstance(data, list):
+                # Keep the unreadable file for inspection and start a new log, so this run's entry is not lost
+                corrupt_file = self.log_file.with_name(
+                    f"{self.log_file.name}.corrupt-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}")
+                self.log_file.rename(corrupt_file)
+                logger.error(f"Could not read strategy log {self.log_file} as a list; moved it to {corrupt_file}")
+                data = []
         else:
             data = []
         # Append the new log entry
         data.append(self.log_entry)
         # Write the updated list back
-        with open(self.log_file, "w") as f:
-            json.dump(data, f, indent=2)
+        # orjson serializes dataclasses (e.g. ClosedPosition) and NumPy values natively
+        with open(self.log_file, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class ClosedPosition:
+    """
+    A short put position bought back by manage_open_puts.
+    """
+    symbol: str
+    underlying: str
+    strike: float
+    reason: str  # 'profit_target' or 'loss_limit'
+    pnl: float
+    premium_collected: float
+    order_id: str
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+from core import _kernels
+from core._kernels import _classify_numpy, classify, NO_CLOSE, PROFIT_TARGET, LOSS_LIMIT
+
+
+PREMIUM = np.array([4.0, 4.0, 4.0, 4.0, 0.0, 2.0], dtype=np.float64)
+CURRENT = np.array([1.0, 7.0, 1.01, 6.99, 1.0, 0.1], dtype=np.float64)
+TARGET_PCT = 0.75
+
+
+def assert_same(result, expected):
+    for actual, wanted in zip(result, expected):
+        np.testing.assert_array_equal(actual, wanted)
+
+
+def test_classify_numpy_thresholds():
+    to_close, reason_codes, pnl, pct = _classify_numpy(PREMIUM, CURRENT, TARGET_PCT)
+    # pct exactly at +/- target closes, just inside does not, zero premium never closes
+    assert reason_codes.tolist() == [PROFIT_TARGET, LOSS_LIMIT, NO_CLOSE, NO_CLOSE, NO_CLOSE, PROFIT_TARGET]
+    assert to_close.tolist() == [True, True, False, False, False, True]
+    assert pct[0] == 0.75 and pct[1] == -0.75
+    assert pct[4] == 0.0
+    np.testing.assert_allclose(pnl, PREMIUM - CURRENT)
+
+
+def test_small_inputs_never_use_numba(monkeypatch):
+    get_kernel = MagicMock(side_effect=AssertionError("Numba used for a small portfolio"))
+    monkeypatch.setattr(_kernels, "_get_numba_kernel", get_kernel)
+    assert_same(classify(PREMIUM, CURRENT, TARGET_PCT), _classify_numpy(PREMIUM, CURRENT, TARGET_PCT))
+    get_kernel.assert_not_called()
+
+
+def test_large_inputs_fall_back_to_numpy_without_numba(monkeypatch):
+    monkeypatch.setattr(_kernels, "_get_numba_kernel", lambda: None)
+    premium = np.tile(PREMIUM, _kernels.NUMBA_MIN_POSITIONS)
+    current = np.tile(CURRENT, _kernels.NUMBA_MIN_POSITIONS)
+    assert_same(classify(premium, current, TARGET_PCT), _classify_numpy(premium, current, TARGET_PCT))
+
+
+@pytest.mark.parametrize("n", [0, len(PREMIUM)])
+def test_numba_kernel_matches_numpy(n):
+    pytest.importorskip("numba")
+    kernel = _kernels._get_numba_kernel()
+    premium, current = PREMIUM[:n], CURRENT[:n]
+    assert_same(kernel(premium, current, TARGET_PCT), _classify_numpy(premium, current, TARGET_PCT))
+
+
+def test_large_inputs_use_numba_when_installed(monkeypatch):
+    pytest.importorskip("numba")
+    get_kernel = MagicMock(wraps=_kernels._get_numba_kernel)
+    monkeypatch.setattr(_kernels, "_get_numba_kernel", get_kernel)
+    premium = np.tile(PREMIUM, _kernels.NUMBA_MIN_POSITIONS)
+    current = np.tile(CURRENT, _kernels.NUMBA_MIN_POSITIONS)
+    assert_same(classify(premium, current, TARGET_PCT), _classify_numpy(premium, current, TARGET_PCT))
+    get_kernel.assert_called_once()
+
+
+def test_empty_arrays():
+    empty = np.empty(0, dtype=np.float64)
+    for to_close, reason_codes, pnl, pct in (_classify_numpy(empty, empty, TARGET_PCT),
+                                             classify(empty, empty, TARGET_PCT)):
+        assert to_close.shape == reason_codes.shape == pnl.shape == pct.shape == (0,)
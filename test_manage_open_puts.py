@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from core.execution import manage_open_puts
+import core.execution as execution
+import numpy as np
 from alpaca.trading.enums import AssetClass
 from alpaca.trading.requests import MarketOrderRequest
 
@@ -38,7 +40,7 @@ def make_snapshot(price):
 def test_no_positions(mock_client, caplog):
     mock_client.get_positions.return_value = []
     result = manage_open_puts(mock_client)
-    assert result is None
+    assert result == []
     assert "No open put positions to manage" in caplog.text
 
 
@@ -47,8 +49,10 @@ def test_only_calls_skipped(mock_client, caplog):
         make_mock_position("AAPL250920C00150000", -1, 2.5)
     ]
     result = manage_open_puts(mock_client)
-    assert result is None
+    assert result == []
     assert "No valid put positions found" in caplog.text
+    mock_client.get_stock_latest_trade.assert_not_called()
+    mock_client.get_option_snapshot.assert_not_called()
 
 
 def test_invalid_option_symbol_skipped(mock_client, caplog):
@@ -57,7 +61,7 @@ def test_invalid_option_symbol_skipped(mock_client, caplog):
         make_mock_position(bad_symbol, -1, 2.0)
     ]
     result = manage_open_puts(mock_client)
-    assert result is None
+    assert result == []
     assert f"Could not parse option symbol {bad_symbol}" in caplog.text
 
 
@@ -76,6 +80,24 @@ def test_put_below_threshold_not_closed(mock_client, caplog):
     assert result == []
     assert "P&L%" in caplog.text
     assert "Buying back" not in caplog.text
+    assert mock_client.get_stock_latest_trade.call_args.kwargs["use_cache"] is True
+    assert mock_client.get_option_snapshot.call_args.kwargs["use_cache"] is True
+
+
+def test_tight_target_fetches_fresh_quotes(mock_client):
+    mock_client.get_positions.return_value = [
+        make_mock_position("AAPL250920P00150000", -1, 2.00)
+    ]
+    mock_client.get_stock_latest_trade.return_value = {
+        "AAPL": MagicMock(price=149.00)
+    }
+    mock_client.get_option_snapshot.return_value = {
+        "AAPL250920P00150000": make_snapshot(price=1.50)
+    }
+
+    manage_open_puts(mock_client, target_pct=0.25)
+    assert mock_client.get_stock_latest_trade.call_args.kwargs["use_cache"] is False
+    assert mock_client.get_option_snapshot.call_args.kwargs["use_cache"] is False
 
 
 def test_put_hits_profit_target_and_closed(mock_client, caplog):
@@ -91,8 +113,8 @@ def test_put_hits_profit_target_and_closed(mock_client, caplog):
 
     result = manage_open_puts(mock_client, target_pct=0.90)
     assert len(result) == 1
-    assert result[0]['symbol'] == "AAPL250920P00150000"
-    assert result[0]['reason'] == 'profit_target'
+    assert result[0].symbol == "AAPL250920P00150000"
+    assert result[0].reason == 'profit_target'
     assert "taking profit" in caplog.text
 
 
@@ -109,7 +131,7 @@ def test_put_hits_loss_limit_and_closed(mock_client, caplog):
 
     result = manage_open_puts(mock_client, target_pct=0.90)
     assert len(result) == 1
-    assert result[0]['reason'] == 'loss_limit'
+    assert result[0].reason == 'loss_limit'
     assert "cutting loss" in caplog.text
 
 
@@ -150,3 +172,95 @@ def test_submit_order_called_correctly(mock_client):
     assert order.side.name == "BUY"
     assert order.type.name == "MARKET"
     assert order.time_in_force.name == "DAY"
+
+
+def test_failed_order_does_not_block_others(mock_client, caplog):
+    mock_client.get_positions.return_value = [
+        make_mock_position("AAPL250920P00150000", -1, 2.00),
+        make_mock_position("MSFT250920P00300000", -1, 4.00)
+    ]
+    mock_client.get_stock_latest_trade.return_value = {
+        "AAPL": MagicMock(price=155.00),
+        "MSFT": MagicMock(price=310.00)
+    }
+    mock_client.get_option_snapshot.return_value = {
+        "AAPL250920P00150000": make_snapshot(price=0.10),
+        "MSFT250920P00300000": make_snapshot(price=0.20)
+    }
+
+    def submit_order(order):
+        if order.symbol == "AAPL250920P00150000":
+            raise RuntimeError("rejected")
+        return MagicMock(id="msft_order_id")
+
+    mock_client.trade_client.submit_order.side_effect = submit_order
+
+    result = manage_open_puts(mock_client, target_pct=0.90)
+    assert mock_client.trade_client.submit_order.call_count == 2
+    assert [p.symbol for p in result] == ["MSFT250920P00300000"]
+    assert result[0].order_id == "msft_order_id"
+    assert "Failed to close position AAPL250920P00150000: rejected" in caplog.text
+
+
+def test_falls_back_to_trade_price_without_quote(mock_client, caplog):
+    snapshot = make_snapshot(price=0.10)
+    snapshot.latest_quote = None
+    mock_client.get_positions.return_value = [
+        make_mock_position("AAPL250920P00150000", -1, 2.00),
+        make_mock_position("MSFT250920P00300000", -1, 4.00),
+        make_mock_position("NVDA250920P00100000", -1, 1.00)
+    ]
+    mock_client.get_stock_latest_trade.return_value = {
+        "AAPL": MagicMock(price=155.00),
+        "MSFT": MagicMock(price=310.00),
+        "NVDA": MagicMock(price=110.00)
+    }
+    mock_client.get_option_snapshot.return_value = {
+        "AAPL250920P00150000": snapshot
+    }
+
+    result = manage_open_puts(mock_client, target_pct=0.90)
+    assert [p.symbol for p in result] == ["AAPL250920P00150000"]
+    assert "No option price data for MSFT250920P00300000, NVDA250920P00100000" in caplog.text
+
+
+def large_portfolio_symbols():
+    return [f"AAPL2509{d:02d}P{strike:08d}" for d in range(1, 29) for strike in range(100000, 125000, 1000)]
+
+
+@pytest.mark.parametrize("gil_enabled", [True, False])
+def test_large_portfolio_parse_paths_agree(monkeypatch, gil_enabled):
+    symbols = large_portfolio_symbols()
+    symbols.insert(300, "INVALID_SYMBOL")
+    symbols.insert(400, "AAPL250920C00150000")
+    monkeypatch.setattr(execution, "_gil_enabled", lambda: gil_enabled)
+
+    indices, underlyings, option_types, strikes, invalid = execution._parse_option_symbols(symbols)
+    expected = execution.parse_option_symbols(symbols)
+    assert len(symbols) > execution.PARALLEL_PARSE_MIN
+    assert indices == expected[0]
+    assert underlyings == expected[1]
+    assert option_types == expected[2]
+    np.testing.assert_array_equal(strikes, expected[3])
+    assert invalid == expected[4] == ["INVALID_SYMBOL"]
+
+
+@pytest.mark.parametrize("gil_enabled", [True, False])
+def test_large_portfolio_managed(mock_client, monkeypatch, gil_enabled):
+    monkeypatch.setattr(execution, "_gil_enabled", lambda: gil_enabled)
+    symbols = large_portfolio_symbols()
+    positions = [make_mock_position(s, -1, 2.00) for s in symbols]
+    positions.insert(300, make_mock_position("INVALID_SYMBOL", -1, 2.00))
+    mock_client.get_positions.return_value = positions
+    mock_client.get_stock_latest_trade.return_value = {
+        "AAPL": MagicMock(price=155.00)
+    }
+    mock_client.get_option_snapshot.return_value = {
+        s: make_snapshot(price=1.50) for s in symbols
+    }
+    mock_client.get_option_snapshot.return_value[symbols[-1]] = make_snapshot(price=0.10)
+
+    result = manage_open_puts(mock_client, target_pct=0.90)
+    assert len(symbols) > 500
+    assert [p.symbol for p in result] == [symbols[-1]]
+    assert result[0].strike == 124.0
@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from unittest.mock import MagicMock, patch
+from core.broker_client import BrokerClient
+from core.utils import TTLCache
+
+
+@pytest.fixture
+def broker():
+    client = BrokerClient(api_key="key", secret_key="secret", paper=True)
+    client.stock_client = MagicMock()
+    client.option_client = MagicMock()
+    return client
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=4, ttl=5)
+    with patch("core.utils.time.monotonic", return_value=100.0):
+        cache.set("AAPL", 1)
+    with patch("core.utils.time.monotonic", return_value=105.0):
+        assert cache.get("AAPL") == 1
+    with patch("core.utils.time.monotonic", return_value=105.1):
+        assert cache.get("AAPL") is None
+        assert cache.get("AAPL") is None
+
+
+def test_ttl_cache_evicts_least_recently_stored_at_maxsize():
+    cache = TTLCache(maxsize=2, ttl=5)
+    with patch("core.utils.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 3)  # Re-storing moves "a" behind "b"
+        cache.set("c", 4)
+        assert cache.get("b") is None
+        assert cache.get("a") == 3
+        assert cache.get("c") == 4
+
+
+def test_ttl_cache_drops_expired_entries_before_evicting():
+    cache = TTLCache(maxsize=2, ttl=5)
+    with patch("core.utils.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("core.utils.time.monotonic", return_value=104.0):
+        cache.set("b", 2)
+    with patch("core.utils.time.monotonic", return_value=106.0):
+        cache.set("c", 3)  # "a" has expired, so "b" is kept
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+
+
+def test_ttl_cache_concurrent_sets_at_maxsize():
+    cache = TTLCache(maxsize=8, ttl=5)
+
+    def fill(prefix):
+        for i in range(5000):
+            cache.set((prefix, i), i)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(fill, range(4)))  # Re-raises any worker exception
+    assert len(cache._data) == 8
+
+
+def test_get_or_fetch_fetches_once_for_concurrent_misses():
+    cache = TTLCache(maxsize=4, ttl=5)
+    calls = []
+    started = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.wait(0.1)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: cache.get_or_fetch("key", fetch), range(4)))
+        started.set()
+    assert results == ["value"] * 4
+    assert len(calls) == 1
+
+
+def test_cached_reuses_response_for_reordered_symbols(broker):
+    first = broker.get_stock_latest_trade(["AAPL", "MSFT"], use_cache=True)
+    second = broker.get_stock_latest_trade(["MSFT", "AAPL"], use_cache=True)
+    assert first is second
+    assert broker.stock_client.get_stock_latest_trade.call_count == 1
+
+
+def test_cached_bypassed_without_use_cache(broker):
+    broker.get_stock_latest_trade(["AAPL"], use_cache=True)
+    broker.get_stock_latest_trade(["AAPL"])
+    broker.get_stock_latest_trade(["AAPL"], use_cache=False)
+    assert broker.stock_client.get_stock_latest_trade.call_count == 3
+
+
+def test_cached_keys_separate_per_method(broker):
+    broker.option_client.get_option_snapshot.return_value = {}
+    broker.get_stock_latest_trade("AAPL", use_cache=True)
+    broker.get_option_snapshot("AAPL", use_cache=True)
+    broker.get_option_snapshot(["AAPL"], use_cache=True)  # Same key as the str form
+    assert broker.stock_client.get_stock_latest_trade.call_count == 1
+    assert broker.option_client.get_option_snapshot.call_count == 1
+
+
+def test_cached_refetches_after_ttl(broker):
+    with patch("core.utils.time.monotonic", return_value=100.0):
+        broker.get_stock_latest_trade(["AAPL"], use_cache=True)
+    with patch("core.utils.time.monotonic", return_value=200.0):
+        broker.get_stock_latest_trade(["AAPL"], use_cache=True)
+    assert broker.stock_client.get_stock_latest_trade.call_count == 2
@@ -0,0 +1,77 @@
+import importlib.util
+import json
+from pathlib import Path
+import numpy as np
+import orjson
+import pytest
+from models.closed_position import ClosedPosition
+
+# The repo's logging/ package shares its name with the standard library, so load the module by path
+_spec = importlib.util.spec_from_file_location(
+    "strategy_logger", Path(__file__).parent / "logging" / "strategy_logger.py")
+strategy_logger = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(strategy_logger)
+StrategyLogger = strategy_logger.StrategyLogger
+
+
+def make_closed_position():
+    return ClosedPosition(
+        symbol="AAPL250920P00150000",
+        underlying="AAPL",
+        strike=150.0,
+        reason="profit_target",
+        pnl=1.9,
+        premium_collected=2.0,
+        order_id="mock_order_id"
+    )
+
+
+def test_save_round_trip_with_closed_position(tmp_path):
+    log_path = tmp_path / "strategy_log.json"
+    for buying_power in (np.float64(5000.0), 4000.0):
+        strat_logger = StrategyLogger(log_path=str(log_path))
+        strat_logger.set_buying_power(buying_power)
+        strat_logger.log_closed_puts([make_closed_position()])
+        strat_logger.save()
+
+    data = orjson.loads(log_path.read_bytes())
+    assert [entry["buying_power"] for entry in data] == [5000.0, 4000.0]
+    assert data[0]["closed_puts"] == [{
+        "symbol": "AAPL250920P00150000",
+        "underlying": "AAPL",
+        "strike": 150.0,
+        "reason": "profit_target",
+        "pnl": 1.9,
+        "premium_collected": 2.0,
+        "order_id": "mock_order_id"
+    }]
+
+
+def test_save_keeps_legacy_log_with_nan(tmp_path):
+    log_path = tmp_path / "strategy_log.json"
+    log_path.write_text(json.dumps([{"datetime": "legacy", "buying_power": float("nan")}], indent=2))
+
+    strat_logger = StrategyLogger(log_path=str(log_path))
+    strat_logger.save()
+
+    data = orjson.loads(log_path.read_bytes())
+    assert len(data) == 2
+    assert data[0]["datetime"] == "legacy"
+
+
+@pytest.mark.parametrize("contents", [b"[{not json", b'{"not": "a list"}'])
+def test_save_moves_unreadable_log_aside(tmp_path, caplog, contents):
+    log_path = tmp_path / "strategy_log.json"
+    log_path.write_bytes(contents)
+
+    strat_logger = StrategyLogger(log_path=str(log_path))
+    strat_logger.log_closed_puts([make_closed_position()])
+    strat_logger.save()
+
+    corrupt_files = list(tmp_path.glob("strategy_log.json.corrupt-*"))
+    assert len(corrupt_files) == 1
+    assert corrupt_files[0].read_bytes() == contents
+    data = orjson.loads(log_path.read_bytes())
+    assert len(data) == 1
+    assert data[0]["closed_puts"][0]["symbol"] == "AAPL250920P00150000"
+    assert "Could not read strategy log" in caplog.text